@@ -3,10 +3,10 @@
 # information.
 
 __author__ = "Patrick Kunzmann"
-__all__ = ["create_api_doc", "skip_non_methods"]
+__all__ = ["create_api_doc", "skip_nonrelevant"]
 
-from os.path import join, isdir
-from os import listdir, makedirs
+from os.path import join, isdir, isfile, getmtime, dirname, realpath
+from os import makedirs, walk, utime
 from importlib import import_module
 import types
 import json
@@ -16,13 +16,10 @@ from collections import OrderedDict
 
 
 _INDENT = " " * 4
-
-
+# Marks the time of the last API documentation generation
+_STAMP_FILE_NAME = ".apidoc_stamp"
 # The categories for functions and classes on the module pages
-# from biotite/doc/apidoc.json
-with open("apidoc.json", "r") as file:
-    _pck_categories = json.load(file, object_pairs_hook=OrderedDict)
-
+_CATEGORIES_FILE_PATH = join(dirname(realpath(__file__)), "apidoc.json")
 
 
 def create_api_doc(src_path, doc_path):
@@ -36,31 +33,53 @@ def create_api_doc(src_path, doc_path):
     doc_path : str
         The path to the API documentation root directory
         (``biotite/doc/apidoc``).
+
+    Notes
+    -----
+    The generation is skipped, if no source file of the package was
+    modified since the last generation.
+    Otherwise, only files whose content changed are rewritten.
+    This keeps the modification time of unchanged files, so that
+    *Sphinx* does not need to read them again in incremental builds.
     """
+    package_path = join(src_path, "biotite")
+    stamp_path = join(doc_path, _STAMP_FILE_NAME)
+    # Traverse the package directory only once for both, the check for
+    # modified files and the page generation
+    directory_index = _index_directories(package_path)
+    if _is_up_to_date(directory_index, stamp_path):
+        return
+
+    # The categories are only required, if the pages are generated
+    with open(_CATEGORIES_FILE_PATH, "r") as file:
+        pck_categories = json.load(file, object_pairs_hook=OrderedDict)
+
     # Create directory to store apidoc
     if not isdir(doc_path):
         makedirs(doc_path)
     package_list = _create_package_doc(
-        "biotite",
-        join(src_path, "biotite"),
-        doc_path
+        "biotite", package_path, doc_path, pck_categories, directory_index
     )
     _create_package_index(doc_path, package_list)
+    # Mark the generation as done
+    open(stamp_path, "w").close()
+    utime(stamp_path)
 
 
-def _create_package_doc(pck, src_path, doc_path):
-    if not _is_package(src_path):
+def _create_package_doc(pck, src_path, doc_path, pck_categories,
+                        directory_index):
+    # Identify all subdirectories and files
+    dirs, files = directory_index[src_path]
+    if "__init__.py" not in files:
         # Directory is not a Python package/subpackage
         # -> Nothing to do
         return []
-    # Identify all subdirectories...
-    content = listdir(src_path)
-    dirs = [f for f in content if isdir(join(src_path, f))]
-    # ... and recursively create also the documentation for them
+    # Recursively create also the documentation for subdirectories
     sub_pck = []
     for directory in dirs:
         sub_pck += _create_package_doc(
-            f"{pck}.{directory}", join(src_path, directory), doc_path
+            f"{pck}.{directory}", join(src_path, directory), doc_path,
+            pck_categories, directory_index
         )
 
     # Import package (__init__.py) and find all attribute names
@@ -81,7 +100,10 @@ def _create_package_doc(pck, src_path, doc_path):
                  and attr not in class_list
                 ]
     # Create *.rst files
-    _create_package_page(doc_path, pck, class_list, func_list, sub_pck)
+    _create_package_page(
+        doc_path, pck, class_list, func_list, sub_pck,
+        pck_categories.get(pck, {})
+    )
     for class_name in class_list:
         _create_class_page(doc_path, pck, class_name)
     for function_name in func_list:
@@ -91,14 +113,9 @@ def _create_package_doc(pck, src_path, doc_path):
 
 
 def _create_package_page(doc_path, package_name,
-                         classes, functions, subpackages):
+                         classes, functions, subpackages, categories):
     attributes = classes + functions
 
-    # Get categories for this package
-    try:
-        categories = _pck_categories[package_name]
-    except KeyError:
-        categories = {}
     # Put all attributes that are not in any category
     # into 'Miscellaneous' category
     misc_attributes = []
@@ -160,8 +177,7 @@ def _create_package_page(doc_path, package_name,
         .. autosummary::
 
     """) + subpackages_string
-    with open(join(doc_path, f"{package_name}.rst"), "w") as f:
-        f.write(file_content)
+    _write_if_changed(join(doc_path, f"{package_name}.rst"), file_content)
 
 
 def _create_class_page(doc_path, package_name, class_name):
@@ -180,8 +196,9 @@ def _create_class_page(doc_path, package_name, class_name):
             :add-heading: Gallery
             :heading-level: "
     """)
-    with open(join(doc_path, f"{package_name}.{class_name}.rst"), "w") as f:
-        f.write(file_content)
+    _write_if_changed(
+        join(doc_path, f"{package_name}.{class_name}.rst"), file_content
+    )
 
 
 def _create_function_page(doc_path, package_name, function_name):
@@ -195,8 +212,9 @@ def _create_function_page(doc_path, package_name, function_name):
             :add-heading: Gallery
             :heading-level: "
     """)
-    with open(join(doc_path, f"{package_name}.{function_name}.rst"), "w") as f:
-        f.write(file_content)
+    _write_if_changed(
+        join(doc_path, f"{package_name}.{function_name}.rst"), file_content
+    )
 
 
 def _create_package_index(doc_path, package_list):
@@ -213,13 +231,52 @@ def _create_package_index(doc_path, package_list):
             :toctree:
 
     """) + packages_string
-    with open(join(doc_path, "index.rst"), "w") as f:
-        f.write(file_content)
+    _write_if_changed(join(doc_path, "index.rst"), file_content)
 
 
-def _is_package(path):
-    content = listdir(path)
-    return "__init__.py" in content
+def _index_directories(path):
+    """
+    Map each directory in the given directory tree to the names of its
+    subdirectories and files.
+    """
+    return {
+        directory: (dir_names, file_names)
+        for directory, dir_names, file_names in walk(path)
+    }
+
+
+def _is_up_to_date(directory_index, stamp_path):
+    """
+    Check whether the stamp file of the last generation is newer than
+    every source file in the package, the category file and this module,
+    which contains the page templates.
+    """
+    if not isfile(stamp_path):
+        return False
+    stamp_time = getmtime(stamp_path)
+    for file_path in (_CATEGORIES_FILE_PATH, realpath(__file__)):
+        if getmtime(file_path) > stamp_time:
+            return False
+    for directory, (_, file_names) in directory_index.items():
+        for file_name in file_names:
+            if not file_name.endswith((".py", ".pyx")):
+                continue
+            if getmtime(join(directory, file_name)) > stamp_time:
+                return False
+    return True
+
+
+def _write_if_changed(path, content):
+    """
+    Write the given content into the file, unless the file already has
+    exactly this content.
+    """
+    if isfile(path):
+        with open(path, "r") as file:
+            if file.read() == content:
+                return
+    with open(path, "w") as file:
+        file.write(content)
 
 
 def skip_nonrelevant(app, what, name, obj, skip, options):
@@ -14,6 +14,7 @@ pyximport.install(
 )
 
 from os.path import realpath, dirname, join
+from concurrent.futures import ThreadPoolExecutor
 import sys
 import warnings
 import pybtex
@@ -42,14 +43,6 @@ import switcher
 # Reset matplotlib params
 matplotlib.rcdefaults()
 
-# Pregeneration of files
-apidoc.create_api_doc(PACKAGE_PATH, join(DOC_PATH, "apidoc"))
-switcher.create_switcher_json(
-    join("static", "switcher.json"),
-    "v0.41.0",
-    n_versions=5
-)
-
 # Use custom citation style
 pybtex.plugin.register_plugin(
     "pybtex.style.formatting", "ieee", bibliography.IEEEStyle
@@ -92,8 +85,11 @@ master_doc = "index"
 
 project = "Biotite"
 copyright = "The Biotite contributors"
-version = biotite.__version__
-release = biotite.__version__
+# Omit the development and local version suffix (e.g. '.dev3+g1a2b3c4'):
+# A change of these configuration values invalidates the entire
+# environment, so each commit would trigger a full rebuild otherwise
+version = ".".join(str(part) for part in biotite.__version_tuple__[:3])
+release = version
 
 exclude_patterns = [
     # These are automatically incorporated by sphinx_gallery
@@ -105,8 +101,6 @@ exclude_patterns = [
 if "plot_gallery=0" in sys.argv:
     exclude_patterns.append("tutorial/**/*.rst")
 
-pygments_style = "sphinx"
-
 todo_include_todos = False
 
 # Prevents numpydoc from creating an autosummary which does not work
@@ -231,5 +225,23 @@ sphinx_gallery_conf = {
 
 #### App setup ####
 
+def pregenerate_files(app):
+    # The version switcher requires a request to GitHub
+    # -> run it concurrently to the API doc generation
+    with ThreadPoolExecutor() as executor:
+        switcher_future = executor.submit(
+            switcher.create_switcher_json,
+            join(DOC_PATH, "static", "switcher.json"),
+            "v0.41.0",
+            n_versions=5
+        )
+        apidoc.create_api_doc(PACKAGE_PATH, join(DOC_PATH, "apidoc"))
+        # Raise potential exceptions from the version switcher creation
+        switcher_future.result()
+
+
 def setup(app):
+    # The files are generated before the source files are collected,
+    # only once in the main process
+    app.connect("builder-inited", pregenerate_files)
     app.connect("autodoc-skip-member", apidoc.skip_nonrelevant)
\ No newline at end of file
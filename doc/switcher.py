@@ -3,7 +3,7 @@
 # information.
 
 __author__ = "Patrick Kunzmann"
-__all__ = ["create_api_doc", "skip_non_methods"]
+__all__ = ["create_switcher_json"]
 
 from dataclasses import dataclass
 from pathlib import Path
@@ -81,5 +81,11 @@ def create_switcher_json(file_path, min_tag, n_versions):
         "url": f"{BIOTITE_URL}/{current_version}/",
         "preferred": True
     })
+    content = json.dumps(version_config, indent=4)
+    # Keep the existing file untouched, if the content did not change,
+    # to avoid unnecessary work in incremental builds
+    file_path = Path(file_path)
+    if file_path.is_file() and file_path.read_text() == content:
+        return
     with open(file_path, "w") as file:
-        json.dump(version_config, file, indent=4)
+        file.write(content)
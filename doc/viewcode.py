@@ -11,8 +11,8 @@ __author__ = "Patrick Kunzmann"
 __all__ = ["linkcode_resolve"]
 
 from importlib import import_module
-from os.path import dirname, join, isdir, splitext
-from os import listdir
+from os.path import dirname, join, isfile, splitext
+from os import scandir
 import inspect
 import biotite
 
@@ -50,8 +50,12 @@ def _index_attributes(package_name, src_path):
     cython_line_index = {}
 
     # Identify all subdirectories...
-    directory_content = listdir(src_path)
-    dirs = [f for f in directory_content if isdir(join(src_path, f))]
+    with scandir(src_path) as entries:
+        entries = list(entries)
+    directory_content = [entry.name for entry in entries]
+    dirs = [
+        entry.name for entry in entries if entry.is_dir(follow_symlinks=False)
+    ]
     # ... and index them recursively
     for directory in dirs:
         sub_attribute_index, sub_cython_line_index = _index_attributes(
@@ -196,8 +200,7 @@ def _index_cython_code(code_lines):
 
 
 def _is_package(path):
-    content = listdir(path)
-    return "__init__.py" in content
+    return isfile(join(path, "__init__.py"))
 
 
 _attribute_index, _cython_line_index = _index_attributes(
@@ -8,24 +8,30 @@ __all__ = ["ClustalOmegaApp"]
 
 from tempfile import NamedTemporaryFile
 import numpy as np
-from ...sequence.sequence import Sequence
-from ...sequence.seqtypes import NucleotideSequence, ProteinSequence
-from ...sequence.io.fasta.file import FastaFile
-from ...sequence.align.alignment import Alignment
 from ...sequence.phylo.tree import Tree
 from ..localapp import cleanup_tempfile
 from ..msaapp import MSAApp
 from ..application import AppState, requires_state
 
 
+# Maps the sequence type given by 'MSAApp.get_seqtype()'
+# to the respective value of the '--seqtype' option
+_SEQTYPES = {
+    "protein": "Protein",
+    "nucleotide": "DNA",
+}
+
+
 class ClustalOmegaApp(MSAApp):
     """
     Perform a multiple sequence alignment using Clustal-Omega.
     
     Parameters
     ----------
-    sequences : list of ProteinSequence or NucleotideSequence
+    sequences : iterable object of ProteinSequence or NucleotideSequence
         The sequences to be aligned.
+        The iterable is only traversed once, hence it may also be a
+        generator.
     bin_path : str, optional
         Path of the Custal-Omega binary.
     matrix : None
@@ -51,7 +57,7 @@ class ClustalOmegaApp(MSAApp):
     
     def __init__(self, sequences, bin_path="clustalo", matrix=None):
         super().__init__(sequences, bin_path, None)
-        self._seq_count = len(sequences)
+        self._seq_count = len(self._sequences)
         self._mbed = True
         self._dist_matrix = None
         self._tree = None
@@ -77,11 +83,8 @@ class ClustalOmegaApp(MSAApp):
             "--force",
             # Tree order for get_alignment_order() to work properly 
             "--output-order=tree-order",
+            "--seqtype", _SEQTYPES[self.get_seqtype()],
         ]
-        if self.get_seqtype() == "protein":
-            args += ["--seqtype", "Protein"]
-        else:
-            args += ["--seqtype", "DNA"]
         if self._tree is None:
             # ClustalOmega does not like when a tree is set
             # as input and output#
@@ -10,10 +10,6 @@ import re
 import os
 from ..msaapp import MSAApp
 from ..application import AppState, requires_state
-from ...sequence.sequence import Sequence
-from ...sequence.seqtypes import NucleotideSequence, ProteinSequence
-from ...sequence.io.fasta.file import FastaFile
-from ...sequence.align.alignment import Alignment
 from ...sequence.phylo.tree import Tree
 
 
@@ -9,6 +9,7 @@ __all__ = ["MSAApp"]
 import abc
 from tempfile import NamedTemporaryFile
 from collections import OrderedDict
+from collections.abc import Sequence as SequenceABC
 import numpy as np
 from .localapp import LocalApp, cleanup_tempfile
 from .application import AppState, requires_state
@@ -57,7 +58,11 @@ class MSAApp(LocalApp, metaclass=abc.ABCMeta):
     
     def __init__(self, sequences, bin_path, matrix=None):
         super().__init__(bin_path)
-        
+
+        if not isinstance(sequences, SequenceABC):
+            # The sequences are accessed multiple times
+            # -> materialize one-shot iterables, e.g. generators
+            sequences = list(sequences)
         if len(sequences) < 2:
             raise ValueError("At least two sequences are required")
         # Check if all sequences share the same alphabet
@@ -14,10 +14,6 @@ from tempfile import NamedTemporaryFile
 from ..localapp import cleanup_tempfile
 from ..msaapp import MSAApp
 from ..application import AppState, VersionError, requires_state
-from ...sequence.sequence import Sequence
-from ...sequence.seqtypes import NucleotideSequence, ProteinSequence
-from ...sequence.align.matrix import SubstitutionMatrix
-from ...sequence.align.alignment import Alignment
 from ...sequence.phylo.tree import Tree
 
 
@@ -6,17 +6,8 @@ __name__ = "biotite.application.muscle"
 __author__ = "Patrick Kunzmann"
 __all__ = ["Muscle5App"]
 
-import numbers
-import warnings
-from tempfile import NamedTemporaryFile
-from ..localapp import cleanup_tempfile
 from ..msaapp import MSAApp
 from ..application import AppState, VersionError, requires_state
-from ...sequence.sequence import Sequence
-from ...sequence.seqtypes import NucleotideSequence, ProteinSequence
-from ...sequence.align.matrix import SubstitutionMatrix
-from ...sequence.align.alignment import Alignment
-from ...sequence.phylo.tree import Tree
 from .app3 import get_version
 
 
@@ -89,8 +89,9 @@ def mass(item, is_residue=None):
     14.007
     """
     global _atom_masses
-    with open(ATOM_MASSES_FILE, "r") as file:
-        _atom_masses = json.load(file)
+    if _atom_masses is None:
+        with open(ATOM_MASSES_FILE, "r") as file:
+            _atom_masses = json.load(file)
 
     if isinstance(item, str):
         if is_residue is None:
@@ -0,0 +1,419 @@
+# This source code is part of the Biotite package and is distributed
+# under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
+# information.
+
+"""
+This module contains the performance critical parts of the *CIF*
+parser.
+"""
+
+__name__ = "biotite.structure.io.pdbx"
+__author__ = "Patrick Kunzmann"
+__all__ = ["CategoryBody", "split_lines", "to_single"]
+
+cimport cython
+cimport numpy as np
+from cpython.unicode cimport Py_UNICODE_ISSPACE, Py_UNICODE_ISLINEBREAK
+
+import numpy as np
+from ....file import DeserializationError
+
+ctypedef np.int64_t int64
+ctypedef np.uint32_t uint32
+
+
+cdef extern from "Python.h":
+    const char* PyUnicode_AsUTF8AndSize(
+        object unicode, Py_ssize_t* size
+    ) except NULL
+    int PyUnicode_KIND(object unicode)
+    void* PyUnicode_DATA(object unicode)
+    Py_UCS4 PyUnicode_READ(int kind, void* data, Py_ssize_t index)
+
+
+cdef enum:
+    # The columns of the value span array
+    LINE = 0
+    START = 1
+    STOP = 2
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def split_lines(str text not None):
+    """
+    Split the text into stripped lines, omitting empty and comment
+    lines.
+
+    This is equivalent to
+
+    .. code-block:: python
+
+        [
+            line.strip() for line in text.splitlines()
+            if line and line[0] != "#" and not line.isspace()
+        ]
+
+    but the text is scanned in a single pass, without creating
+    :class:`str` objects for omitted lines.
+
+    Parameters
+    ----------
+    text : str
+        The text to be split.
+
+    Returns
+    -------
+    lines : list of str
+        The stripped lines.
+    """
+    cdef list lines = []
+    cdef Py_ssize_t length = len(text)
+    # Read the characters directly from the internal representation
+    cdef int kind = PyUnicode_KIND(text)
+    cdef void* data = PyUnicode_DATA(text)
+    cdef Py_ssize_t i = 0
+    cdef Py_ssize_t line_start, start, stop
+    cdef Py_UCS4 c
+
+    while i < length:
+        line_start = i
+        while i < length:
+            c = PyUnicode_READ(kind, data, i)
+            if _is_linebreak(c):
+                break
+            i += 1
+        stop = i
+        # Skip the line break, where '\r\n' counts as a single one
+        if i < length:
+            i += 1
+            if (
+                c == u"\r" and i < length
+                and PyUnicode_READ(kind, data, i) == u"\n"
+            ):
+                i += 1
+
+        if stop > line_start and (
+            PyUnicode_READ(kind, data, line_start) == u"#"
+        ):
+            # Comment line
+            continue
+        start = line_start
+        while start < stop and Py_UNICODE_ISSPACE(
+            PyUnicode_READ(kind, data, start)
+        ):
+            start += 1
+        while stop > start and Py_UNICODE_ISSPACE(
+            PyUnicode_READ(kind, data, stop - 1)
+        ):
+            stop -= 1
+        if start < stop:
+            lines.append(text[start:stop])
+    return lines
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def to_single(list lines not None):
+    """
+    Convert multiline values into singleline values
+    (in terms of `lines` list elements).
+
+    Linebreaks are preserved.
+    The line of a converted multiline value is marked by a leading
+    ``;``.
+
+    Parameters
+    ----------
+    lines : list of str
+        The lines to be converted, as returned by :func:`split_lines()`.
+
+    Returns
+    -------
+    lines : list of str
+        The converted lines.
+    """
+    cdef list processed_lines = []
+    cdef Py_ssize_t n_lines = len(lines)
+    cdef Py_ssize_t i = 0
+    cdef Py_ssize_t j
+    cdef str line
+
+    while i < n_lines:
+        line = lines[i]
+        if PyUnicode_READ(PyUnicode_KIND(line), PyUnicode_DATA(line), 0) \
+                == u";":
+            # Multiline value
+            j = lines.index(";", i + 1)
+            # Create a line for the multiline string only,
+            # which is marked by the leading ';' of its first line
+            processed_lines.append("\n".join(lines[i : j]))
+            i = j + 1
+        else:
+            processed_lines.append(line)
+            i += 1
+    return processed_lines
+
+
+cdef class CategoryBody:
+    """
+    The tokenized data lines of a category.
+
+    Only the positions of the values are determined on creation.
+    The values themselves are only created, when the respective column
+    is requested.
+
+    Parameters
+    ----------
+    lines : list of str
+        The data lines of the category.
+        For looped categories these are the lines after the key lines.
+        The lines must not contain leading whitespace.
+        Multiline values must be already merged into a single line,
+        that is marked by a leading ``;``.
+    n_columns : int
+        The number of columns in the category.
+    expect_whitespace : bool, optional
+        If false, it is assumed that quoted values do not contain
+        whitespace.
+        In this case the line is simply split at whitespace and quotes
+        are removed afterwards, which is slightly faster.
+
+    Attributes
+    ----------
+    n_columns : int
+        The number of columns in the category.
+    n_rows : int
+        The number of rows in the category.
+    """
+
+    cdef list _lines
+    # Each row contains the line index, start and exclusive stop
+    # of a value
+    cdef np.ndarray _spans
+    cdef readonly Py_ssize_t n_columns
+    cdef readonly Py_ssize_t n_rows
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    def __init__(self, list lines not None, Py_ssize_t n_columns,
+                 bint expect_whitespace=True):
+        # Rows may be split over multiple lines -> do not rely on
+        # row-line-alignment at all and collect the value positions
+        # in a flat array
+        # Usually each line contains exactly one row
+        # -> allocate enough space for this case to avoid reallocations
+        cdef Py_ssize_t capacity = max(len(lines) * n_columns, 1)
+        cdef np.ndarray spans_array = np.empty((capacity, 3), dtype=np.int64)
+        cdef int64[:, :] spans = spans_array
+        cdef Py_ssize_t n_values = 0
+
+        cdef Py_ssize_t line_i
+        cdef str line
+        cdef const char* chars
+        cdef Py_ssize_t length
+        cdef Py_ssize_t i, start, stop
+        cdef char quote
+
+        for line_i in range(len(lines)):
+            line = lines[line_i]
+            chars = PyUnicode_AsUTF8AndSize(line, &length)
+            i = 0
+            while i < length:
+                if i == 0 and chars[0] == c";":
+                    # Multiline value -> the entire line is the value
+                    start = 1
+                    stop = length
+                    i = length
+
+                else:
+                    # Skip whitespace between values
+                    while i < length and _is_whitespace(chars[i]):
+                        i += 1
+                    if i == length:
+                        break
+
+                    if expect_whitespace and (
+                        chars[i] == c"'" or chars[i] == c'"'
+                    ):
+                        # Quoted value: It may contain whitespace and
+                        # even the quote character itself, as long as
+                        # it is not followed by whitespace
+                        quote = chars[i]
+                        start = i + 1
+                        i = start
+                        while i < length and not (
+                            chars[i] == quote and (
+                                i + 1 == length
+                                or _is_whitespace(chars[i + 1])
+                            )
+                        ):
+                            i += 1
+                        if i == length:
+                            raise DeserializationError(
+                                f"Missing closing quote in line '{line}'"
+                            )
+                        stop = i
+                        # Skip the closing quote
+                        i += 1
+                    else:
+                        start = i
+                        while i < length and not _is_whitespace(chars[i]):
+                            i += 1
+                        stop = i
+                        if (chars[start] == c"'" or chars[start] == c'"') \
+                                and chars[stop - 1] == chars[start]:
+                            # Remove quotes
+                            if stop - start == 1:
+                                # The value is only a quote character
+                                stop = start
+                            else:
+                                start += 1
+                                stop -= 1
+
+                if n_values == capacity:
+                    capacity *= 2
+                    spans_array = _enlarge(spans_array, capacity)
+                    spans = spans_array
+                spans[n_values, LINE] = line_i
+                spans[n_values, START] = start
+                spans[n_values, STOP] = stop
+                n_values += 1
+
+        if n_values % n_columns != 0:
+            raise DeserializationError(
+                f"The number of values ({n_values}) is not a multiple of "
+                f"the number of columns ({n_columns})"
+            )
+        self._lines = lines
+        if n_values < capacity:
+            # Rows split over multiple lines lead to an oversized array
+            # -> copy to release the unused memory
+            self._spans = spans_array[:n_values].copy()
+        else:
+            self._spans = spans_array
+        self.n_columns = n_columns
+        self.n_rows = n_values // n_columns
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    def get_column(self, Py_ssize_t index):
+        """
+        Get the values of a column.
+
+        The array is directly filled from the UTF-8 representation of
+        the lines, without creating a :class:`str` object for each
+        value.
+
+        Parameters
+        ----------
+        index : int
+            The index of the column.
+
+        Returns
+        -------
+        values : ndarray, dtype=str
+            The values of the column.
+        """
+        if index < 0 or index >= self.n_columns:
+            raise IndexError(
+                f"Index {index} is out of range for "
+                f"{self.n_columns} columns"
+            )
+
+        cdef int64[:, :] spans = self._spans
+        cdef Py_ssize_t n_rows = self.n_rows
+        cdef Py_ssize_t i, j, pos, span_i
+        cdef Py_ssize_t line_i
+        cdef const unsigned char* chars = NULL
+        cdef Py_ssize_t length
+        cdef unsigned char c
+
+        # Determine the required string length
+        # Zero-length string types are not supported by NumPy
+        cdef Py_ssize_t n_chars
+        cdef Py_ssize_t max_n_chars = 1
+        line_i = -1
+        for i in range(n_rows):
+            # The values of each column are at every n-th position
+            span_i = i * self.n_columns + index
+            if spans[span_i, LINE] != line_i:
+                line_i = spans[span_i, LINE]
+                # The UTF-8 representation is cached by the 'str' object
+                chars = <const unsigned char*> PyUnicode_AsUTF8AndSize(
+                    self._lines[line_i], &length
+                )
+            n_chars = 0
+            for pos in range(spans[span_i, START], spans[span_i, STOP]):
+                # Count all bytes except continuation bytes
+                if chars[pos] & 0xC0 != 0x80:
+                    n_chars += 1
+            if n_chars > max_n_chars:
+                max_n_chars = n_chars
+
+        values = np.zeros(n_rows, dtype=f"U{max_n_chars}")
+        cdef uint32[:, :] code_points = values.view(np.uint32).reshape(
+            n_rows, max_n_chars
+        )
+        line_i = -1
+        for i in range(n_rows):
+            span_i = i * self.n_columns + index
+            if spans[span_i, LINE] != line_i:
+                line_i = spans[span_i, LINE]
+                chars = <const unsigned char*> PyUnicode_AsUTF8AndSize(
+                    self._lines[line_i], &length
+                )
+            # Decode UTF-8
+            # As the bytes originate from a 'str' object,
+            # they are always valid UTF-8
+            pos = spans[span_i, START]
+            j = 0
+            while pos < spans[span_i, STOP]:
+                c = chars[pos]
+                if c < 0x80:
+                    code_points[i, j] = c
+                    pos += 1
+                elif c < 0xE0:
+                    code_points[i, j] = (
+                        (c & 0x1F) << 6
+                        | (chars[pos + 1] & 0x3F)
+                    )
+                    pos += 2
+                elif c < 0xF0:
+                    code_points[i, j] = (
+                        (c & 0x0F) << 12
+                        | (chars[pos + 1] & 0x3F) << 6
+                        | (chars[pos + 2] & 0x3F)
+                    )
+                    pos += 3
+                else:
+                    code_points[i, j] = (
+                        (c & 0x07) << 18
+                        | (chars[pos + 1] & 0x3F) << 12
+                        | (chars[pos + 2] & 0x3F) << 6
+                        | (chars[pos + 3] & 0x3F)
+                    )
+                    pos += 4
+                j += 1
+        return values
+
+
+cdef np.ndarray _enlarge(np.ndarray spans, Py_ssize_t capacity):
+    """
+    Get a copy of the given span array with the given number of rows.
+    Only the original rows are initialized.
+    """
+    cdef np.ndarray new_spans = np.empty((capacity, 3), dtype=np.int64)
+    new_spans[:len(spans)] = spans
+    return new_spans
+
+
+cdef inline bint _is_linebreak(Py_UCS4 c):
+    if c < 0x80:
+        # Fast path for ASCII characters
+        return (c >= 0x0A and c <= 0x0D) or (c >= 0x1C and c <= 0x1E)
+    return Py_UNICODE_ISLINEBREAK(c)
+
+
+cdef inline bint _is_whitespace(char c):
+    return c == c" " or c == c"\t"
@@ -6,16 +6,31 @@ __name__ = "biotite.structure.io.pdbx"
 __author__ = "Patrick Kunzmann"
 __all__ = ["CIFFile", "CIFBlock", "CIFCategory", "CIFColumn", "CIFData"]
 
-import itertools
-import shlex
+import re
 from collections.abc import MutableMapping, Sequence
 import numpy as np
 from .component import _Component, MaskValue
+from ._cif_parser import CategoryBody, split_lines, to_single
 from ....file import File, is_open_compatible, is_text, DeserializationError, \
                      SerializationError
 
 
 UNICODE_CHAR_SIZE = 4
+# The patterns below match at line starts via the preceding line break:
+# A literal prefix allows a much faster search than the '^' anchor
+# Matches the header line of a data block and captures the block name
+DATA_BLOCK_PATTERN = re.compile(r"\ndata_([^\r\n]*)")
+# Matches either a 'loop_' line or a key line, whose category name is
+# captured
+CATEGORY_PATTERN = re.compile(r"\n(?:loop_|_([^.\r\n]*)\.)")
+# Values containing these characters must be quoted or put into
+# a multiline string
+QUOTE_REQUIRING_CODE_POINTS = np.array(
+    [ord(char) for char in "'\" \t\n"], dtype=np.uint32
+)
+# Matches the first character that requires a single-line value to be
+# quoted
+QUOTE_REQUIRING_PATTERN = re.compile(r"[ \t'\"]")
 
 
 # Small class without much functionality
@@ -133,16 +148,20 @@ class CIFColumn:
         if not isinstance(data, CIFData):
             data = CIFData(data, str)
         if mask is None:
-            mask = np.full(
-                len(data), MaskValue.PRESENT, dtype=np.uint8
-            )
-            mask[data.array == "."] = MaskValue.INAPPLICABLE
-            mask[data.array == "?"] = MaskValue.MISSING
-            if np.all(mask == MaskValue.PRESENT):
-                # No mask required
-                mask = None
-            else:
-                mask = CIFData(mask)
+            # Only string arrays may contain '.' or '?' values
+            # -> no mask required otherwise
+            if np.issubdtype(data.array.dtype, np.str_):
+                is_inapplicable = data.array == "."
+                is_missing = data.array == "?"
+                # The mask is only created,
+                # if there is at least one masked value
+                if is_inapplicable.any() or is_missing.any():
+                    mask = np.full(
+                        len(data), MaskValue.PRESENT, dtype=np.uint8
+                    )
+                    mask[is_inapplicable] = MaskValue.INAPPLICABLE
+                    mask[is_missing] = MaskValue.MISSING
+                    mask = CIFData(mask)
         else:
             if not isinstance(mask, CIFData):
                 mask = CIFData(mask, np.uint8)
@@ -217,24 +236,27 @@ class CIFColumn:
             ``'?'`` depending on the :class:`MaskValue`.
         """
         if self._mask is None:
-            return self._data.array.astype(dtype, copy=False)
+            return _convert(self._data.array, dtype)
 
         elif np.issubdtype(dtype, np.str_):
             # Limit float precision to 3 decimals
             if np.issubdtype(self._data.array.dtype, np.floating):
                 array = np.array(
-                    [f"{e:.3f}" for e in self._data.array], type=dtype
+                    [f"{e:.3f}" for e in self._data.array.tolist()],
+                    dtype=dtype
                 )
             else:
                 # Copy, as otherwise original data would be overwritten
                 # with mask values
                 array = self._data.array.astype(dtype, copy=True)
+            mask = self._mask.array
             if masked_value is None:
-                array[self._mask.array == MaskValue.INAPPLICABLE] = "."
-                array[self._mask.array == MaskValue.MISSING] = "?"
+                array[mask == MaskValue.INAPPLICABLE] = "."
+                array[mask == MaskValue.MISSING] = "?"
             else:
-                array[self._mask.array == MaskValue.INAPPLICABLE] = masked_value
-                array[self._mask.array == MaskValue.MISSING] = masked_value
+                # Both kinds of masked values get the same value
+                # -> a single pass suffices
+                array[mask != MaskValue.PRESENT] = masked_value
             return array
 
         else:
@@ -247,8 +269,8 @@ class CIFColumn:
                 array = np.full(len(self._data), masked_value, dtype=dtype)
 
             present_mask = self._mask.array == MaskValue.PRESENT
-            array[present_mask] = (
-                self._data.array[present_mask].astype(dtype)
+            array[present_mask] = _convert(
+                self._data.array[present_mask], dtype
             )
             return array
 
@@ -334,6 +356,10 @@ class CIFCategory(_Component, MutableMapping):
 
         self._row_count = None
         self._columns = columns
+        # For deserialized looped categories:
+        # The tokenized values, from which the columns are parsed
+        # on demand
+        self._body = None
 
     @property
     def name(self):
@@ -361,9 +387,8 @@ class CIFCategory(_Component, MutableMapping):
 
     @staticmethod
     def deserialize(text, expect_whitespace=True):
-        lines = [
-            line.strip() for line in text.splitlines() if not _is_empty(line)
-        ]
+        # Skip empty and comment lines
+        lines = split_lines(text)
 
         if _is_loop_start(lines[0]):
             is_looped = True
@@ -377,14 +402,16 @@ class CIFCategory(_Component, MutableMapping):
                 "Failed to parse category name"
             )
 
-        lines = _to_single(lines, is_looped)
+        lines = to_single(lines)
         if is_looped:
-            category_dict = CIFCategory._deserialize_looped(
-                lines, expect_whitespace
+            category = CIFCategory(name=category_name)
+            category._body, category._columns = (
+                CIFCategory._deserialize_looped(lines, expect_whitespace)
             )
+            return category
         else:
             category_dict = CIFCategory._deserialize_single(lines)
-        return CIFCategory(category_dict, category_name)
+            return CIFCategory(category_dict, category_name)
 
     def serialize(self):
         if self._name is None:
@@ -392,13 +419,19 @@ class CIFCategory(_Component, MutableMapping):
         if not self._columns:
             raise ValueError("At least one column is required")
 
-        for column_name, column in self.items():
+        # Use '_columns' directly to avoid parsing columns
+        # that were not accessed yet
+        for column_name, column in self._columns.items():
+            if isinstance(column, CIFColumn):
+                column_length = len(column)
+            else:
+                column_length = self._body.n_rows
             if self._row_count is None:
-                self._row_count = len(column)
-            elif len(column) != self._row_count:
+                self._row_count = column_length
+            elif column_length != self._row_count:
                 raise SerializationError(
                     f"All columns must have the same length, "
-                    f"but '{column_name}' has length {len(column)}, "
+                    f"but '{column_name}' has length {column_length}, "
                     f"while the first column has row_count {self._row_count}"
                 )
 
@@ -413,7 +446,14 @@ class CIFCategory(_Component, MutableMapping):
         return "\n".join(lines)
 
     def __getitem__(self, key):
-        return self._columns[key]
+        column = self._columns[key]
+        if not isinstance(column, CIFColumn):
+            # Only the index of the column in the tokenized values
+            # is stored -> the column must be parsed first
+            column = CIFColumn(self._body.get_column(column))
+            # Update with parsed object
+            self._columns[key] = column
+        return column
 
     def __setitem__(self, key, column):
         if not isinstance(column, CIFColumn):
@@ -447,21 +487,26 @@ class CIFCategory(_Component, MutableMapping):
         """
         Process a category where each field has a single value.
         """
-        category_dict = {}
-        for line in lines:
-            parts = shlex.split(line)
-            column_name = parts[0].split(".")[1]
-            column = parts[1]
-            category_dict[column_name] = CIFColumn(column)
-        return category_dict
+        # Keys and values alternate, but a value may also be located in
+        # the line after its key
+        # -> treat them as table with a key column and a value column
+        body = CategoryBody(lines, 2)
+        keys = body.get_column(0).tolist()
+        values = body.get_column(1).tolist()
+        return {
+            key.split(".")[1]: CIFColumn(value)
+            for key, value in zip(keys, values)
+        }
 
     @staticmethod
     def _deserialize_looped(lines, expect_whitespace):
         """
         Process a category where each field has multiple values
         (category is a table).
+        Only the values are tokenized, the columns are parsed when
+        accessed.
+        Hence, only the index of each column is returned.
         """
-        category_dict = {}
         column_names = []
         i = 0
         for key_line in lines:
@@ -469,36 +514,13 @@ class CIFCategory(_Component, MutableMapping):
                 # Key line
                 key = key_line.split(".")[1]
                 column_names.append(key)
-                category_dict[key] = []
                 i += 1
             else:
                 break
 
-        data_lines = lines[i:]
-        # Rows may be split over multiple lines -> do not rely on
-        # row-line-alignment at all and simply cycle through columns
-        column_names = itertools.cycle(column_names)
-        for data_line in data_lines:
-            # If whitespace is expected in quote protected values,
-            # use standard shlex split
-            # Otherwise use much more faster whitespace split
-            # and quote removal if applicable,
-            # bypassing the slow shlex module
-            if expect_whitespace:
-                values = shlex.split(data_line)
-            else:
-                values = data_line.split()
-                for k in range(len(values)):
-                    # Remove quotes
-                    if (values[k][0] == '"' and values[k][-1] == '"') or (
-                        values[k][0] == "'" and values[k][-1] == "'"
-                    ):
-                        values[k] = values[k][1:-1]
-            for val in values:
-                column_name = next(column_names)
-                category_dict[column_name].append(val)
-
-        return category_dict
+        body = CategoryBody(lines[i:], len(column_names), expect_whitespace)
+        column_indices = {name: i for i, name in enumerate(column_names)}
+        return body, column_indices
 
     def _serialize_single(self):
         keys = ["_" + self._name + "." + name for name in self.keys()]
@@ -517,13 +539,29 @@ class CIFCategory(_Component, MutableMapping):
         ]
 
         column_arrays = []
-        for column in self.values():
-            array = column.as_array(str)
+        for column in self._columns.values():
+            if isinstance(column, CIFColumn):
+                array = column.as_array(str)
+            else:
+                # The column was not accessed yet:
+                # The tokenized values already contain the '.' and '?'
+                # -> there is no need to create a masked 'CIFColumn'
+                array = self._body.get_column(column)
+            # The code points are accessed via a view on the raw data
+            # -> ensure contiguous data in native byte order
+            array = np.ascontiguousarray(
+                array, dtype=array.dtype.newbyteorder("=")
+            )
             # Quote before measuring the number of chars,
             # as the quote characters modify the length
-            array = np.array(
-                [_multiline(_quote(element)) for element in array]
-            )
+            # Usually only few values require quoting
+            # -> only process these
+            requires_quoting = _requires_quoting(array)
+            if requires_quoting.any():
+                elements = array.tolist()
+                for i in np.nonzero(requires_quoting)[0].tolist():
+                    elements[i] = _multiline(_quote(elements[i]))
+                array = np.array(elements)
             column_arrays.append(array)
 
         # Number of characters the longest string in the column needs
@@ -533,12 +571,24 @@ class CIFCategory(_Component, MutableMapping):
             array.dtype.itemsize // UNICODE_CHAR_SIZE + 1
             for array in column_arrays
         ]
-        value_lines = [""] * self._row_count
-        for i in range(self._row_count):
-            for j, array in enumerate(column_arrays):
-                value_lines[i] += array[i].ljust(column_n_chars[j])
-            # Remove trailing justification of last column
-            value_lines[i].rstrip()
+        # Write the code points of all columns into a single buffer,
+        # where each row represents a line
+        n_rows = len(column_arrays[0])
+        line_n_chars = sum(column_n_chars)
+        code_points = np.zeros((n_rows, line_n_chars), dtype=np.uint32)
+        start = 0
+        for array, n_chars in zip(column_arrays, column_n_chars):
+            code_points[:, start : start + n_chars - 1] = (
+                array.view(np.uint32).reshape(n_rows, n_chars - 1)
+            )
+            start += n_chars
+        # Justify the values by replacing the trailing null characters
+        # with whitespace
+        # The last column is not justified to avoid trailing whitespace:
+        # Trailing null characters are removed by NumPy
+        justified = code_points[:, : line_n_chars - column_n_chars[-1]]
+        justified[justified == 0] = ord(" ")
+        value_lines = code_points.view(f"U{line_n_chars}").ravel().tolist()
 
         return ["loop_"] + key_lines + value_lines
 
@@ -599,37 +649,38 @@ class CIFBlock(_Component, MutableMapping):
 
     @staticmethod
     def deserialize(text):
-        lines = text.splitlines()
         current_category_name = None
+        loop_start = None
         category_starts = []
         category_names = []
-        for i, line in enumerate(lines):
-            if not _is_empty(line):
-                is_loop_in_line = _is_loop_start(line)
-                category_name_in_line = _parse_category_name(line)
-                if is_loop_in_line or (
-                    category_name_in_line != current_category_name
-                    and category_name_in_line is not None
-                ):
-                    # Track the new category
-                    if is_loop_in_line:
-                        # In case of lines with "loop_" the category is
-                        # in the next line
-                        category_name_in_line = _parse_category_name(
-                            lines[i + 1]
-                        )
-                    current_category_name = category_name_in_line
-                    category_starts.append(i)
-                    category_names.append(current_category_name)
+        # Only the 'loop_' and key lines are visited,
+        # instead of splitting the entire text into lines
+        for line_start, _, category_name_in_line in _find_at_line_starts(
+            CATEGORY_PATTERN, text
+        ):
+            if category_name_in_line is None:
+                # In case of lines with "loop_" the category is
+                # in the next key line
+                loop_start = line_start
+            elif loop_start is not None:
+                current_category_name = category_name_in_line
+                category_starts.append(loop_start)
+                category_names.append(current_category_name)
+                loop_start = None
+            elif category_name_in_line != current_category_name:
+                # Track the new category
+                current_category_name = category_name_in_line
+                category_starts.append(line_start)
+                category_names.append(current_category_name)
         return CIFBlock(_create_element_dict(
-            lines, category_names, category_starts
+            text, category_names, category_starts
         ))
 
     def serialize(self):
         text_blocks = []
         for category_name, category in self._categories.items():
             if isinstance(category, str):
-                # Category is already stored as lines
+                # Category is already stored as text
                 text_blocks.append(category)
             else:
                 try:
@@ -649,15 +700,7 @@ class CIFBlock(_Component, MutableMapping):
             # Element is stored in serialized form
             # -> must be deserialized first
             try:
-                # Special optimization for "atom_site":
-                # Even if the values are quote protected,
-                # no whitespace is expected in escaped values
-                # Therefore slow shlex.split() call is not necessary
-                if key == "atom_site":
-                    expect_whitespace = False
-                else:
-                    expect_whitespace = True
-                category = CIFCategory.deserialize(category, expect_whitespace)
+                category = CIFCategory.deserialize(category)
             except:
                 raise DeserializationError(
                     f"Failed to deserialize category '{key}'"
@@ -689,6 +732,11 @@ class CIFBlock(_Component, MutableMapping):
         if set(self.keys()) != set(other.keys()):
             return False
         for cat_name in self.keys():
+            if _is_same_text(
+                self._categories[cat_name], other._categories[cat_name]
+            ):
+                # No need to deserialize the categories
+                continue
             if self[cat_name] != other[cat_name]:
                 return False
         return True
@@ -786,16 +834,19 @@ class CIFFile(_Component, File, MutableMapping):
 
     @staticmethod
     def deserialize(text):
-        lines = text.splitlines()
-        block_starts = []
-        block_names = []
-        for i, line in enumerate(lines):
-            if not _is_empty(line):
-                data_block_name = _parse_data_block_name(line)
-                if data_block_name is not None:
-                    block_starts.append(i)
-                    block_names.append(data_block_name)
-        return CIFFile(_create_element_dict(lines, block_names, block_starts))
+        # Search the block headers in the entire text at once,
+        # instead of inspecting each line separately
+        headers = _find_at_line_starts(DATA_BLOCK_PATTERN, text)
+        block_stops = [start for start, _, _ in headers[1:]]
+        block_stops.append(len(text))
+        # Lazy deserialization
+        # -> keep as text for now and deserialize later if needed
+        # The header line itself is not part of the block text
+        return CIFFile({
+            block_name: text[_skip_line_break(text, header_stop) : block_stop]
+            for (_, header_stop, block_name), block_stop
+            in zip(headers, block_stops)
+        })
 
     def serialize(self):
         text_blocks = []
@@ -899,42 +950,86 @@ class CIFFile(_Component, File, MutableMapping):
         if set(self.keys()) != set(other.keys()):
             return False
         for block_name in self.keys():
+            if _is_same_text(
+                self._blocks[block_name], other._blocks[block_name]
+            ):
+                # No need to deserialize the blocks
+                continue
             if self[block_name] != other[block_name]:
                 return False
         return True
 
 
-def _is_empty(line):
-    return len(line.strip()) == 0 or line[0] == "#"
+def _is_same_text(element, other_element):
+    """
+    Check whether both elements are still stored in serialized form
+    and the text is identical, which implies equality.
+    """
+    return (
+        isinstance(element, str)
+        and isinstance(other_element, str)
+        and element == other_element
+    )
+
+
+def _find_at_line_starts(pattern, text):
+    """
+    Find all matches of the given `pattern` at line starts in `text`.
+
+    The `pattern` must start with a line break, i.e. it matches the end
+    of the preceding line.
+    Hence, the first line is checked separately, which avoids copying
+    the entire `text` to prepend a line break.
+
+    Returns
+    -------
+    matches : list of tuple(int, int, str or None)
+        The start and exclusive stop of each match, excluding the
+        leading line break, and its first group.
+    """
+    first_line_stop = text.find("\n")
+    first_line = text if first_line_stop == -1 else text[:first_line_stop+1]
+    first_match = pattern.match("\n" + first_line)
+    # Subtract the prepended line break
+    matches = [] if first_match is None else [
+        (0, first_match.end() - 1, first_match.group(1))
+    ]
+    matches.extend(
+        (match.start() + 1, match.end(), match.group(1))
+        for match in pattern.finditer(text)
+    )
+    return matches
+
+
+def _skip_line_break(text, pos):
+    """
+    Get the position after the line break at `pos` in `text`.
+    If there is no line break at `pos`, `pos` is returned.
+    """
+    if text.startswith("\r\n", pos):
+        return pos + 2
+    elif text.startswith("\n", pos) or text.startswith("\r", pos):
+        return pos + 1
+    else:
+        return pos
 
 
-def _create_element_dict(lines, element_names, element_starts):
+def _create_element_dict(text, element_names, element_starts):
     """
     Create a dict mapping the `element_names` to the corresponding
-    `lines`, which are located between ``element_starts[i]`` and
+    part of `text`, which is located between ``element_starts[i]`` and
     ``element_starts[i+1]``.
     """
     # Add exclusive stop to indices for easier slicing
-    element_starts.append(len(lines))
+    element_starts.append(len(text))
     # Lazy deserialization
     # -> keep as text for now and deserialize later if needed
     return {
-        element_name: "\n".join(lines[element_starts[i] : element_starts[i+1]])
+        element_name: text[element_starts[i] : element_starts[i+1]]
         for i, element_name in enumerate(element_names)
     }
 
 
-def _parse_data_block_name(line):
-    """
-    If the line defines a data block, return this name.
-    Return ``None`` otherwise.
-    """
-    if line.startswith("data_"):
-        return line[5:]
-    else:
-        return None
-
-
 def _parse_category_name(line):
     """
     If the line defines a category, return this name.
@@ -953,47 +1048,6 @@ def _is_loop_start(line):
     return line.startswith("loop_")
 
 
-def _to_single(lines, is_looped):
-    """
-    Convert multiline values into singleline values
-    (in terms of 'lines' list elements).
-    Linebreaks are preserved.
-    """
-    processed_lines = [None] * len(lines)
-    in_i = 0
-    out_i = 0
-    while in_i < len(lines):
-        if lines[in_i][0] == ";":
-            # Multiline value
-            multi_line_str = lines[in_i][1:]
-            j = in_i + 1
-            while lines[j] != ";":
-                # Preserve linebreaks
-                multi_line_str += "\n" + lines[j]
-                j += 1
-            if is_looped:
-                # Create a line for the multiline string only
-                processed_lines[out_i] = shlex.quote(multi_line_str)
-                out_i += 1
-            else:
-                # Append multiline string to previous line
-                processed_lines[out_i - 1] += " " + shlex.quote(multi_line_str)
-            in_i = j + 1
-
-        elif not is_looped and lines[in_i][0] != "_":
-            # Singleline value in the line after the corresponding key
-            processed_lines[out_i - 1] += " " + lines[in_i]
-            in_i += 1
-
-        else:
-            # Normal singleline value in the same row as the key
-            processed_lines[out_i] = lines[in_i]
-            in_i += 1
-            out_i += 1
-
-    return [line for line in processed_lines if line is not None]
-
-
 def _quote(value):
     """
     A less secure but much quicker version of ``shlex.quote()``.
@@ -1002,16 +1056,46 @@ def _quote(value):
         return "''"
     elif value[0] == "_":
         return "'" + value + "'"
+    # Scan the value only once for all relevant characters
+    elif QUOTE_REQUIRING_PATTERN.search(value) is None:
+        return value
     elif "'" in value:
         return '"' + value + '"'
-    elif '"' in value:
-        return "'" + value + "'"
-    elif " " in value:
-        return "'" + value + "'"
-    elif "\t" in value:
+    else:
         return "'" + value + "'"
+
+
+def _convert(array, dtype):
+    """
+    Convert the given array into the given dtype.
+
+    Parsing strings into numbers is faster via Python objects than via
+    :meth:`ndarray.astype()`.
+    """
+    if array.dtype.kind == "U" and np.issubdtype(dtype, np.number):
+        return np.array(array.tolist(), dtype=dtype)
     else:
-        return value
+        return array.astype(dtype, copy=False)
+
+
+def _requires_quoting(array):
+    """
+    Get a boolean mask of the values in a string array that are changed
+    by :func:`_quote()` or :func:`_multiline()`.
+
+    The `array` must be contiguous and in native byte order, as its
+    code points are read directly from the underlying data.
+    """
+    code_points = array.view(np.uint32).reshape(
+        len(array), array.dtype.itemsize // UNICODE_CHAR_SIZE
+    )
+    first_code_points = code_points[:, 0]
+    return (
+        # Empty strings
+        (first_code_points == 0)
+        | (first_code_points == ord("_"))
+        | np.isin(code_points, QUOTE_REQUIRING_CODE_POINTS).any(axis=1)
+    )
 
 
 def _multiline(value):
@@ -1025,6 +1109,10 @@ def _multiline(value):
 
 
 def _arrayfy(data):
+    # Fast path for the common case of a non-empty plain NumPy array
+    # Subclasses are still converted by 'np.asarray()'
+    if type(data) is np.ndarray and data.ndim > 0 and len(data) > 0:
+        return data
     if not isinstance(data, (Sequence, np.ndarray)) or isinstance(data, str):
         data = [data]
     elif len(data) == 0:
@@ -15,7 +15,6 @@ import numpy as np
 from .atoms import Atom, AtomArray, AtomArrayStack, coord
 from .util import vector_dot, norm_vector
 from .error import BadStructureError
-from .geometry import distance
 from .info.masses import mass
 
 
@@ -43,10 +42,12 @@ def gyration_radius(array, masses=None):
         containing the radii of gyration for every model is returned.
     """
     if masses is None:
-        masses = np.array([mass(element) for element in array.element])
+        masses = _atom_masses(array)
     center = mass_center(array, masses)
-    radii = distance(array, center[..., np.newaxis, :])
-    inertia_moment = np.sum(masses * radii*radii, axis=-1)
+    diff = array.coord - center[..., np.newaxis, :]
+    # Sum the mass-weighted squared distances in a single operation,
+    # instead of computing the distances and squaring them afterwards
+    inertia_moment = np.einsum("i,...ij,...ij->...", masses, diff, diff)
     return np.sqrt(inertia_moment / np.sum(masses))
 
 def mass_center(array, masses=None):
@@ -71,5 +72,20 @@ def mass_center(array, masses=None):
         a (*n x 3*) :class:`ndarray` is returned.
     """
     if masses is None:
-        masses = np.array([mass(element) for element in array.element])
-    return np.sum(masses[:,np.newaxis] * array.coord, axis=-2) / np.sum(masses)
\ No newline at end of file
+        masses = _atom_masses(array)
+    else:
+        # Accumulate in 64-bit precision,
+        # even if both masses and coordinates are 'float32'
+        masses = np.asarray(masses, dtype=np.float64)
+    # Matrix-vector product avoids a temporary array of weighted coordinates
+    return np.matmul(masses, array.coord) / np.sum(masses)
+
+
+def _atom_masses(array):
+    """
+    Get the standard atomic mass for each atom in the given array or
+    stack.
+    """
+    # Look up each element only once
+    elements, indices = np.unique(array.element, return_inverse=True)
+    return np.array([mass(element) for element in elements])[indices]
@@ -113,6 +113,25 @@ def test_large_sequence_number(app_cls):
         [i]*SEQ_NUMBER for i in range(SEQ_LENGTH)
     ]
 
+
+@pytest.mark.parametrize("app_cls", [MuscleApp, MafftApp, ClustalOmegaApp])
+def test_iterable_input(sequences, app_cls):
+    """
+    Test whether a one-shot iterable, such as a generator, gives the
+    same alignment as a list of sequences.
+    """
+    bin_path = BIN_PATH[app_cls]
+    if is_not_installed(bin_path):
+        pytest.skip(f"'{bin_path}' is not installed")
+
+    try:
+        ref_alignment = app_cls.align(sequences)
+        test_alignment = app_cls.align(seq for seq in sequences)
+    except VersionError:
+        pytest.skip("Invalid software version")
+    assert str(test_alignment) == str(ref_alignment)
+
+
 def test_additional_options(sequences):
     bin_path = BIN_PATH[ClustalOmegaApp]
     if is_not_installed(bin_path):
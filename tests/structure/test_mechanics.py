@@ -22,4 +22,20 @@ def test_gyration_radius():
     # Same for atom array instead of stack
     array = stack[0]
     radius = struc.gyration_radius(array)
-    assert radius == pytest.approx(exp_radii[0], abs=2e-2)
\ No newline at end of file
+    assert radius == pytest.approx(exp_radii[0], abs=2e-2)
+
+
+def test_mass_center_precision():
+    """
+    Check if the center of mass is computed with 64-bit precision, even
+    if the masses are given as 32-bit floats.
+    """
+    stack = strucio.load_structure(join(data_dir("structure"), "1l2y.bcif"))
+    masses = np.random.default_rng(0).uniform(1, 20, stack.array_length())
+    ref_center = np.sum(
+        masses[:, np.newaxis] * stack.coord.astype(np.float64), axis=-2
+    ) / np.sum(masses)
+
+    test_center = struc.mass_center(stack, masses.astype(np.float32))
+    assert test_center.dtype == np.float64
+    assert test_center == pytest.approx(ref_center, abs=1e-5)
@@ -8,7 +8,6 @@ import itertools
 from os.path import join, splitext
 import numpy as np
 import pytest
-from pytest import approx
 import biotite
 import biotite.structure.info as info
 import biotite.structure.io.mmtf as mmtf
@@ -76,10 +75,10 @@ def test_array_conversion(path, model):
     a2 = mmtf.get_structure(mmtf_file, model=model, include_bonds=True)
 
     for category in a1.get_annotation_categories():
-        assert a1.get_annotation(category).tolist() == \
-               a2.get_annotation(category).tolist()
-    assert a1.coord.flatten().tolist() == \
-           approx(a2.coord.flatten().tolist(), abs=1e-3)
+        assert np.array_equal(
+            a1.get_annotation(category), a2.get_annotation(category)
+        )
+    assert np.allclose(a1.coord, a2.coord, atol=1e-3)
     assert a1.bonds == a2.bonds
     if a1.box is not None:
         assert np.allclose(a1.box, a2.box)
@@ -130,10 +129,10 @@ def test_pdbx_consistency(path, model):
     for category in [
         c for c in a1.get_annotation_categories() if c != "hetero"
     ]:
-        assert a1.get_annotation(category).tolist() == \
-               a2.get_annotation(category).tolist()
-    assert a1.coord.flatten().tolist() == \
-           approx(a2.coord.flatten().tolist(), abs=1e-3)
+        assert np.array_equal(
+            a1.get_annotation(category), a2.get_annotation(category)
+        )
+    assert np.allclose(a1.coord, a2.coord, atol=1e-3)
 
 
 @pytest.mark.parametrize(
@@ -174,10 +173,11 @@ def test_pdbx_consistency_assembly(path, model):
     for category in [
         c for c in ref_assembly.get_annotation_categories() if c != "hetero"
     ]:
-        assert test_assembly.get_annotation(category).tolist() == \
-                ref_assembly.get_annotation(category).tolist()
-    assert test_assembly.coord.flatten().tolist() == \
-           approx(ref_assembly.coord.flatten().tolist(), abs=1e-3)
+        assert np.array_equal(
+            test_assembly.get_annotation(category),
+            ref_assembly.get_annotation(category)
+        )
+    assert np.allclose(test_assembly.coord, ref_assembly.coord, atol=1e-3)
 
 
 def test_extra_fields():
@@ -200,10 +200,10 @@ def test_extra_fields():
         ]
     )
 
-    assert stack1.atom_id.tolist() == stack2.atom_id.tolist()
-    assert stack1.b_factor.tolist() == approx(stack2.b_factor.tolist())
-    assert stack1.occupancy.tolist() == approx(stack2.occupancy.tolist())
-    assert stack1.charge.tolist() == stack2.charge.tolist()
+    assert np.array_equal(stack1.atom_id, stack2.atom_id)
+    assert np.allclose(stack1.b_factor, stack2.b_factor)
+    assert np.allclose(stack1.occupancy, stack2.occupancy)
+    assert np.array_equal(stack1.charge, stack2.charge)
 
 
 def test_numpy_objects():
@@ -37,7 +37,10 @@ def test_get_model_count(format):
 @pytest.mark.parametrize(
     "string, looped",
     itertools.product(
-        ["", " ", "  ", "te  xt", "'", '"' ,"te\nxt", "\t",],
+        [
+            "", " ", "  ", "te  xt", "'", '"' ,"te\nxt", "\t",
+            "te\\xt", "te'xt",
+        ],
         [False, True]
     ),
 )
@@ -59,6 +62,24 @@ def test_escape(string, looped):
     assert test_value == ref_value
 
 
+@pytest.mark.parametrize("looped", [False, True])
+def test_non_ascii(looped):
+    """
+    Test whether values containing characters with multi-byte UTF-8
+    representations are properly deserialized.
+    """
+    # Contains characters with 1, 2, 3 and 4 bytes
+    ref_values = ["abc", "Ångström", "€ 10", "\U0001F600"]
+    if not looped:
+        ref_values = ref_values[1:2]
+    ref_category = pdbx.CIFCategory({"test_col": ref_values}, "test_cat")
+
+    test_category = pdbx.CIFCategory.deserialize(ref_category.serialize())
+    test_values = test_category["test_col"].as_array(str).tolist()
+
+    assert test_values == ref_values
+
+
 @pytest.mark.parametrize(
     "format, path, model",
     itertools.product(
@@ -303,6 +324,16 @@ def test_unequal_lengths(format):
         Category(invalid_category_dict).serialize()
 
 
+def test_incomplete_row():
+    """
+    Check if deserializing a looped category, whose number of values is
+    not a multiple of the number of columns, raises an exception.
+    """
+    text = "loop_\n_foo.bar\n_foo.baz\n1 2\n3\n"
+    with pytest.raises(biotite.DeserializationError):
+        pdbx.CIFCategory.deserialize(text)
+
+
 def test_setting_empty_column():
     """
     Check if setting an empty column raises an exception.
@@ -313,6 +344,22 @@ def test_setting_empty_column():
         pdbx.CIFCategory({"foo": []})
 
 
+def test_masked_float_column():
+    """
+    Check if a masked floating point column is converted into strings
+    with three decimals and the mask values.
+    """
+    column = pdbx.CIFColumn(
+        pdbx.CIFData(np.array([1.0, 2.0, 3.0])),
+        mask=[
+            pdbx.MaskValue.PRESENT,
+            pdbx.MaskValue.INAPPLICABLE,
+            pdbx.MaskValue.MISSING,
+        ]
+    )
+    assert column.as_array(str).tolist() == ["1.000", ".", "?"]
+
+
 def test_setting_empty_structure():
     """
     Check if setting an empty structure raises an exception.
@@ -653,6 +700,91 @@ def test_serialization_consistency(format, create_new_encoding):
             raise Exception(f"Comparison failed for '{category_name}.{key}'")
 
 
+def test_lazy_serialization():
+    """
+    Check if serializing a file, whose blocks and categories were not
+    accessed and hence are still stored as text, gives the same data
+    after deserialization.
+    """
+    path = join(data_dir("structure"), "1aki.cif")
+    ref_file = pdbx.CIFFile.read(path)
+    test_file = pdbx.CIFFile.deserialize(
+        pdbx.CIFFile.read(path).serialize()
+    )
+
+    assert list(test_file.keys()) == list(ref_file.keys())
+    for block_name, ref_block in ref_file.items():
+        test_block = test_file[block_name]
+        assert list(test_block.keys()) == list(ref_block.keys())
+        for category_name, ref_category in ref_block.items():
+            test_category = test_block[category_name]
+            assert list(test_category.keys()) == list(ref_category.keys())
+            for key in ref_category.keys():
+                assert test_category[key] == ref_category[key]
+
+
+@pytest.mark.parametrize(
+    "array",
+    [
+        # Strided array
+        np.array(["x", "y z", "_w", "v"])[::2],
+        # Non-native byte order
+        np.array(["x", "y z"], dtype=">U3"),
+    ]
+)
+def test_serialization_memory_layout(array):
+    """
+    Check if columns are serialized correctly, regardless of the memory
+    layout of the underlying string array.
+    """
+    ref_values = array.tolist()
+    category = pdbx.CIFCategory(
+        {"a": pdbx.CIFColumn(pdbx.CIFData(array)), "b": ["1", "2"]},
+        name="c"
+    )
+
+    test_category = pdbx.CIFCategory.deserialize(category.serialize())
+    assert test_category["a"].as_array().tolist() == ref_values
+
+
+def test_file_equality():
+    """
+    Check if files are equal if and only if their contents are equal,
+    regardless of whether their blocks and categories were already
+    accessed.
+    """
+    path = join(data_dir("structure"), "1aki.cif")
+    ref_file = pdbx.CIFFile.read(path)
+    test_file = pdbx.CIFFile.read(path)
+    assert test_file == ref_file
+
+    # Access the categories of only one of the files
+    for _ in test_file.block.values():
+        pass
+    assert test_file == ref_file
+
+    test_file.block["entry"]["id"] = "1ABC"
+    assert test_file != ref_file
+
+
+@pytest.mark.parametrize(
+    "text, ref_block_names",
+    [
+        ("#\ndata_a\ndata_b\n_x.y 1\n", ["a", "b"]),
+        ("data_a\n#\ndata_b\ndata_c\n_x.y 1\n", ["a", "b", "c"]),
+        ("data_a\r\ndata_b\r\n_x.y 1\r\n", ["a", "b"]),
+    ]
+)
+def test_consecutive_blocks(text, ref_block_names):
+    """
+    Check if data block headers directly following each other, i.e.
+    empty data blocks, are found.
+    """
+    cif_file = pdbx.CIFFile.deserialize(text)
+    assert list(cif_file.keys()) == ref_block_names
+    assert cif_file[ref_block_names[-1]]["x"]["y"].as_item() == "1"
+
+
 def test_legacy_pdbx():
     PDB_ID = "1aki"
 